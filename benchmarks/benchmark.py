@@ -1,10 +1,16 @@
 import requests
 import time
 import json
+import gzip
 import statistics
 import concurrent.futures
 from typing import List, Dict
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 class APIBenchmark:
     def __init__(self, python_url: str = "http://python-api:8000", rust_url: str = "http://rust-api:8001"):
         self.python_url = python_url
@@ -113,6 +119,57 @@ class APIBenchmark:
             "concurrent_users": concurrent_users
         }
     
+    def compression_benchmark(self, url: str, batch_sizes: List[int] = [1, 50, 200], iterations: int = 20) -> Dict:
+        """Compare wire bytes per prediction and latency with and without body compression.
+
+        Latency includes client-side encoding of the request, which a real
+        client pays on every call. Byte counts cover request and response bodies.
+        """
+        encodings = ["identity", "gzip"] + (["zstd"] if zstandard is not None else [])
+        encoders = {
+            "identity": lambda body: body,
+            "gzip": lambda body: gzip.compress(body, mtime=0),
+            "zstd": lambda body: zstandard.ZstdCompressor().compress(body),
+        }
+        results = {}
+        
+        for batch_size in batch_sizes:
+            samples = self.test_data['samples']
+            features = [samples[i % len(samples)] for i in range(batch_size)]
+            body = json.dumps({"features": features}).encode()
+            
+            for encoding in encodings:
+                headers = {"Content-Type": "application/json", "Accept-Encoding": encoding}
+                if encoding != "identity":
+                    headers["Content-Encoding"] = encoding
+                
+                # Warm up
+                requests.post(f"{url}/predict/batch", data=encoders[encoding](body), headers=headers)
+                
+                latencies = []
+                wire_bytes = []
+                for _ in range(iterations):
+                    start_time = time.perf_counter()
+                    payload = encoders[encoding](body)
+                    response = requests.post(f"{url}/predict/batch", data=payload, headers=headers)
+                    end_time = time.perf_counter()
+                    
+                    if response.status_code == 200:
+                        latencies.append((end_time - start_time) * 1000)
+                        # Content-Length is the encoded size; requests transparently decodes gzip
+                        response_bytes = int(response.headers.get("Content-Length", len(response.content)))
+                        wire_bytes.append(len(payload) + response_bytes)
+                
+                if latencies:
+                    results[f"batch_{batch_size}_{encoding}"] = {
+                        "avg_latency_ms": statistics.mean(latencies),
+                        "p95_latency_ms": statistics.quantiles(latencies, n=20)[18] if len(latencies) >= 20 else max(latencies),
+                        "bytes_per_prediction": statistics.mean(wire_bytes) / batch_size,
+                        "uncompressed_request_bytes": len(body)
+                    }
+        
+        return results
+    
     def run_full_benchmark(self):
         """Run complete benchmark suite"""
         print("Starting benchmarks...")
@@ -143,6 +200,11 @@ class APIBenchmark:
                 print("  Running concurrent request benchmark...")
                 results[name]["concurrent_requests"] = self.concurrent_benchmark(url)
                 
+                # Body compression is only implemented by the Python API
+                if name == "python":
+                    print("  Running compression benchmark...")
+                    results[name]["compression"] = self.compression_benchmark(url)
+                
             except Exception as e:
                 print(f"  Error benchmarking {name}: {e}")
                 results[name]["error"] = str(e)
@@ -192,6 +254,13 @@ class APIBenchmark:
                 print(f"  Python: {py_batch:.1f} items/sec")
                 print(f"  Rust:   {rust_batch:.1f} items/sec")
                 print(f"  Speedup: {batch_speedup:.2f}x")
+            
+            # Compression effect on the Python API
+            compression = results["python"].get("compression", {})
+            if compression:
+                print(f"\nPython Body Compression:")
+                for key, stats in compression.items():
+                    print(f"  {key:<20} {stats['bytes_per_prediction']:>9.1f} bytes/pred  {stats['avg_latency_ms']:>7.2f}ms avg")
 
 if __name__ == "__main__":
     benchmark = APIBenchmark()
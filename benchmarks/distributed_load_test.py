@@ -0,0 +1,369 @@
+import requests
+import time
+import json
+import math
+import socket
+import argparse
+import threading
+import multiprocessing
+import concurrent.futures
+from collections import Counter
+from typing import Dict
+
+# Delay between broadcasting a job and its synchronized start, so every
+# worker (local or remote) has received it before the clock starts
+START_DELAY_SEC = 2.0
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (~2% precision) that merges by adding counts"""
+
+    GROWTH = 1.02
+    MIN_MS = 0.001
+
+    def __init__(self):
+        self.counts = Counter()
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float):
+        bucket = int(math.log(max(latency_ms, self.MIN_MS) / self.MIN_MS, self.GROWTH))
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.min_ms = min(self.min_ms, latency_ms)
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts.update(other.counts)
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound of the bucket holding the given percentile"""
+        target = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(self.MIN_MS * self.GROWTH ** (bucket + 1), self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            "counts": {str(bucket): n for bucket, n in self.counts.items()},
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "min_ms": self.min_ms if self.count else None,
+            "max_ms": self.max_ms
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.counts = Counter({int(bucket): n for bucket, n in data["counts"].items()})
+        histogram.count = data["count"]
+        histogram.total_ms = data["total_ms"]
+        histogram.min_ms = data["min_ms"] if data["min_ms"] is not None else math.inf
+        histogram.max_ms = data["max_ms"]
+        return histogram
+
+def send_message(stream, message: Dict):
+    stream.write((json.dumps(message) + "\n").encode())
+    stream.flush()
+
+def receive_message(stream) -> Dict:
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Peer closed the connection")
+    return json.loads(line)
+
+def run_job(job: Dict) -> Dict:
+    """Open-loop constant-rate load against one URL.
+
+    Latency is measured from each request's scheduled send time rather than
+    its actual send time, so a saturated server (or generator) shows up as
+    latency instead of silently lowering the offered rate.
+    """
+    samples = job["samples"]
+    interval = 1.0 / job["rate"]
+    total_requests = int(job["rate"] * job["duration_sec"])
+    histogram = LatencyHistogram()
+    errors = Counter()
+    lock = threading.Lock()
+    local = threading.local()
+
+    # Wait for the synchronized start shared by all workers
+    time.sleep(max(0.0, job["start_at"] - time.time()))
+    start_time = time.perf_counter()
+
+    def fire(request_id: int):
+        scheduled = start_time + request_id * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        payload = {"features": samples[request_id % len(samples)]}
+
+        try:
+            response = local.session.post(job["url"], json=payload, timeout=30)
+            latency_ms = (time.perf_counter() - scheduled) * 1000
+            with lock:
+                if response.status_code == 200:
+                    histogram.record(latency_ms)
+                else:
+                    errors[f"HTTP {response.status_code}"] += 1
+        except Exception as e:
+            with lock:
+                errors[type(e).__name__] += 1
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=job["threads"]) as executor:
+        list(executor.map(fire, range(total_requests)))
+
+    return {
+        "histogram": histogram.to_dict(),
+        "errors": dict(errors),
+        "total_requests": total_requests,
+        "total_time_sec": time.perf_counter() - start_time
+    }
+
+def run_worker(coordinator_host: str, coordinator_port: int):
+    """Connect to a coordinator and run the jobs it sends until told to stop"""
+    while True:
+        try:
+            sock = socket.create_connection((coordinator_host, coordinator_port))
+            break
+        except OSError:
+            time.sleep(1)
+
+    with sock, sock.makefile("rwb") as stream:
+        send_message(stream, {"type": "hello", "host": socket.gethostname()})
+        while True:
+            message = receive_message(stream)
+            if message["type"] == "shutdown":
+                return
+            send_message(stream, {"type": "result", **run_job(message["job"])})
+
+class DistributedLoadCoordinator:
+    """Splits a target request rate across worker processes and merges their results.
+
+    Workers can be spawned locally (one Python process each, so the client is
+    not bound to one core by the GIL) or started on other hosts with
+    `python distributed_load_test.py --connect <host>:<port>`.
+    Remote starts assume the hosts' clocks are NTP-synchronized.
+    """
+
+    def __init__(self, num_workers: int, local_workers: int, port: int = 5557,
+                 python_url: str = "http://python-api:8000", rust_url: str = "http://rust-api:8001"):
+        self.num_workers = num_workers
+        self.local_workers = local_workers
+        self.port = port
+        self.python_url = python_url
+        self.rust_url = rust_url
+        self.workers = []
+        self.processes = []
+
+        # Load test data
+        with open('/app/model/test_data.json', 'r') as f:
+            self.test_data = json.load(f)
+
+    def wait_for_apis(self):
+        """Wait for both APIs to be ready"""
+        print("Waiting for APIs to be ready...")
+        for name, url in [("Python", self.python_url), ("Rust", self.rust_url)]:
+            while True:
+                try:
+                    response = requests.get(f"{url}/health", timeout=5)
+                    if response.status_code == 200:
+                        print(f"{name} API is ready!")
+                        break
+                except:
+                    pass
+                time.sleep(2)
+
+    def start_workers(self):
+        """Listen for workers, spawning the local ones, until all have connected"""
+        server = socket.create_server(("0.0.0.0", self.port))
+
+        for _ in range(self.local_workers):
+            process = multiprocessing.Process(target=run_worker, args=("127.0.0.1", self.port), daemon=True)
+            process.start()
+            self.processes.append(process)
+
+        print(f"Waiting for {self.num_workers} workers on port {self.port} ({self.local_workers} local)...")
+        while len(self.workers) < self.num_workers:
+            conn, address = server.accept()
+            stream = conn.makefile("rwb")
+            hello = receive_message(stream)
+            self.workers.append((conn, stream))
+            print(f"  Worker {len(self.workers)}/{self.num_workers} connected from {hello['host']} ({address[0]})")
+        server.close()
+
+    def stop_workers(self):
+        for conn, stream in self.workers:
+            try:
+                send_message(stream, {"type": "shutdown"})
+            except OSError:
+                pass
+            stream.close()
+            conn.close()
+        for process in self.processes:
+            process.join(timeout=5)
+
+    def distributed_load_test(self, url: str, target_rps: float = 2000, duration_sec: float = 10,
+                              threads_per_worker: int = 32) -> Dict:
+        """Run one synchronized job across all workers and merge the results"""
+        start_at = time.time() + START_DELAY_SEC
+        job = {
+            "url": f"{url}/predict",
+            "rate": target_rps / len(self.workers),
+            "duration_sec": duration_sec,
+            "threads": threads_per_worker,
+            "start_at": start_at,
+            "samples": self.test_data['samples']
+        }
+
+        print(f"Offering {target_rps:.0f} req/sec for {duration_sec}s across {len(self.workers)} workers...")
+        for _, stream in self.workers:
+            send_message(stream, {"type": "job", "job": job})
+
+        histogram = LatencyHistogram()
+        errors = Counter()
+        total_requests = 0
+        total_time = 0.0
+        per_worker_rps = []
+        for _, stream in self.workers:
+            result = receive_message(stream)
+            worker_histogram = LatencyHistogram.from_dict(result["histogram"])
+            histogram.merge(worker_histogram)
+            errors.update(result["errors"])
+            total_requests += result["total_requests"]
+            total_time = max(total_time, result["total_time_sec"])
+            per_worker_rps.append(worker_histogram.count / result["total_time_sec"])
+
+        report = {
+            "target_rps": target_rps,
+            "workers": len(self.workers),
+            "total_requests": total_requests,
+            "successful_requests": histogram.count,
+            "failed_requests": total_requests - histogram.count,
+            "success_rate_percent": (histogram.count / total_requests) * 100 if total_requests else 0,
+            "total_time_sec": total_time,
+            "requests_per_sec": histogram.count / total_time if total_time else 0,
+            "per_worker_requests_per_sec": per_worker_rps,
+            "errors": dict(errors)
+        }
+
+        if histogram.count:
+            report.update({
+                "avg_latency_ms": histogram.total_ms / histogram.count,
+                "median_latency_ms": histogram.percentile(50),
+                "p95_latency_ms": histogram.percentile(95),
+                "p99_latency_ms": histogram.percentile(99),
+                "min_latency_ms": histogram.min_ms,
+                "max_latency_ms": histogram.max_ms
+            })
+        else:
+            report["error"] = "All requests failed"
+
+        return report
+
+    def run_distributed_load_test(self, target_rps: float, duration_sec: float, threads_per_worker: int):
+        """Run the distributed load test on both APIs"""
+        print("🔥 DISTRIBUTED LOAD TEST")
+        print("="*50)
+
+        self.wait_for_apis()
+        self.start_workers()
+
+        results = {
+            "python": {},
+            "rust": {},
+            "timestamp": time.time(),
+            "test_config": {
+                "target_rps": target_rps,
+                "duration_sec": duration_sec,
+                "workers": self.num_workers,
+                "threads_per_worker": threads_per_worker
+            }
+        }
+
+        try:
+            for name, url in [("python", self.python_url), ("rust", self.rust_url)]:
+                print(f"\n🚀 Testing {name.upper()} API...")
+                try:
+                    results[name] = self.distributed_load_test(url, target_rps, duration_sec, threads_per_worker)
+                    print(f"✅ {name.upper()} test completed!")
+                except Exception as e:
+                    print(f"❌ Error testing {name}: {e}")
+                    results[name]["error"] = str(e)
+        finally:
+            self.stop_workers()
+
+        with open('/app/results/distributed_load_test_results.json', 'w') as f:
+            json.dump(results, f, indent=2)
+
+        self.print_comparison(results)
+        return results
+
+    def print_comparison(self, results: Dict):
+        """Print merged load test comparison"""
+        print("\n" + "="*60)
+        print("🏆 DISTRIBUTED LOAD TEST RESULTS")
+        print("="*60)
+
+        for name in ["python", "rust"]:
+            result = results[name]
+            if "error" in result:
+                print(f"\n❌ {name.capitalize()} API failed: {result['error']}")
+                continue
+
+            print(f"\n📊 {name.capitalize()} ({result['workers']} workers, target {result['target_rps']:.0f} req/sec):")
+            print(f"  Achieved: {result['requests_per_sec']:.1f} req/sec")
+            print(f"  P50/P95/P99: {result['median_latency_ms']:.1f} / {result['p95_latency_ms']:.1f} / {result['p99_latency_ms']:.1f}ms")
+            print(f"  Success rate: {result['success_rate_percent']:.1f}%")
+            if result["errors"]:
+                print(f"  Errors: {result['errors']}")
+
+        if "error" not in results["python"] and "error" not in results["rust"]:
+            speedup = results["rust"]["requests_per_sec"] / results["python"]["requests_per_sec"]
+            print(f"\n🚀 Rust achieved {speedup:.2f}x the Python throughput")
+            for name in ["python", "rust"]:
+                if results[name]["requests_per_sec"] < 0.95 * results[name]["target_rps"]:
+                    print(f"  ⚠️  {name.capitalize()} fell short of the offered rate, so it was the bottleneck")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Multi-process load generation with merged results")
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                        help="Run as a worker for the coordinator at HOST:PORT")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(),
+                        help="Total workers to wait for (default: CPU count)")
+    parser.add_argument("--local-workers", type=int, default=None,
+                        help="Workers to spawn on this host (default: all of them)")
+    parser.add_argument("--port", type=int, default=5557, help="Coordinator listen port")
+    parser.add_argument("--rate", type=float, default=2000, help="Total target requests/sec")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per API")
+    parser.add_argument("--threads", type=int, default=32, help="Request threads per worker")
+    parser.add_argument("--python-url", default="http://python-api:8000")
+    parser.add_argument("--rust-url", default="http://rust-api:8001")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+        run_worker(host, int(port))
+    else:
+        coordinator = DistributedLoadCoordinator(
+            num_workers=args.workers,
+            local_workers=args.workers if args.local_workers is None else args.local_workers,
+            port=args.port,
+            python_url=args.python_url,
+            rust_url=args.rust_url
+        )
+        coordinator.run_distributed_load_test(args.rate, args.duration, args.threads)
@@ -0,0 +1,251 @@
+import requests
+import grpc
+import numpy as np
+import time
+import json
+import statistics
+import concurrent.futures
+from typing import List, Dict
+
+import inference_pb2
+import inference_pb2_grpc
+
+class GRPCBenchmark:
+    """Compare REST (JSON over HTTP/1.1) and gRPC (packed float32) on the Python API"""
+
+    def __init__(self, rest_url: str = "http://python-api:8000", grpc_target: str = "python-api:50051"):
+        self.rest_url = rest_url
+        self.grpc_target = grpc_target
+        self.channel = grpc.insecure_channel(grpc_target)
+        self.stub = inference_pb2_grpc.InferenceStub(self.channel)
+        
+        # Load test data
+        with open('/app/model/test_data.json', 'r') as f:
+            self.test_data = json.load(f)
+    
+    def wait_for_apis(self):
+        """Wait for the REST and gRPC endpoints to be ready"""
+        print("Waiting for APIs to be ready...")
+        while True:
+            try:
+                if requests.get(f"{self.rest_url}/health", timeout=5).status_code == 200:
+                    print("REST API is ready!")
+                    break
+            except:
+                pass
+            time.sleep(2)
+        grpc.channel_ready_future(self.channel).result()
+        print("gRPC API is ready!")
+    
+    def make_request(self, features: List[List[float]]):
+        array = np.asarray(features, dtype="<f4")
+        tensor = inference_pb2.Tensor(shape=list(array.shape), data=array.tobytes())
+        return inference_pb2.PredictRequest(features=tensor)
+    
+    def grpc_predict(self, features: List[List[float]]) -> bool:
+        """Unary Predict; False when the server shed or failed the request"""
+        try:
+            self.stub.Predict(self.make_request(features))
+            return True
+        except grpc.RpcError:
+            return False
+    
+    @staticmethod
+    def summarize(latencies: List[float]) -> Dict:
+        return {
+            "avg_latency_ms": statistics.mean(latencies),
+            "p50_latency_ms": statistics.median(latencies),
+            "p95_latency_ms": statistics.quantiles(latencies, n=20)[18] if len(latencies) >= 20 else max(latencies),
+            "p99_latency_ms": statistics.quantiles(latencies, n=100)[98] if len(latencies) >= 100 else max(latencies),
+            "total_requests": len(latencies)
+        }
+    
+    def single_request_benchmark(self, num_requests: int = 500) -> Dict:
+        """Sequential single-row predictions over REST and unary gRPC"""
+        samples = self.test_data['samples']
+        rest_latencies, grpc_latencies = [], []
+        session = requests.Session()
+        
+        for i in range(num_requests):
+            features = samples[i % len(samples)]
+            
+            start_time = time.perf_counter()
+            response = session.post(f"{self.rest_url}/predict", json={"features": features})
+            end_time = time.perf_counter()
+            if response.status_code == 200:
+                rest_latencies.append((end_time - start_time) * 1000)
+            
+            start_time = time.perf_counter()
+            ok = self.grpc_predict([features])
+            end_time = time.perf_counter()
+            if ok:
+                grpc_latencies.append((end_time - start_time) * 1000)
+        
+        return {"rest": self.summarize(rest_latencies), "grpc": self.summarize(grpc_latencies)}
+    
+    def batch_request_benchmark(self, batch_sizes: List[int] = [1, 10, 50, 100, 200], iterations: int = 10) -> Dict:
+        """Batch predictions over REST and unary gRPC"""
+        samples = self.test_data['samples']
+        session = requests.Session()
+        results = {}
+        
+        for batch_size in batch_sizes:
+            features = [samples[i % len(samples)] for i in range(batch_size)]
+            
+            # Warm up
+            session.post(f"{self.rest_url}/predict/batch", json={"features": features})
+            self.grpc_predict(features)
+            
+            rest_latencies, grpc_latencies = [], []
+            for _ in range(iterations):
+                start_time = time.perf_counter()
+                response = session.post(f"{self.rest_url}/predict/batch", json={"features": features})
+                end_time = time.perf_counter()
+                if response.status_code == 200:
+                    rest_latencies.append((end_time - start_time) * 1000)
+                
+                start_time = time.perf_counter()
+                ok = self.grpc_predict(features)
+                end_time = time.perf_counter()
+                if ok:
+                    grpc_latencies.append((end_time - start_time) * 1000)
+            
+            results[f"batch_{batch_size}"] = {
+                "rest": {
+                    "avg_latency_ms": statistics.mean(rest_latencies),
+                    "throughput_per_sec": batch_size / (statistics.mean(rest_latencies) / 1000)
+                },
+                "grpc": {
+                    "avg_latency_ms": statistics.mean(grpc_latencies),
+                    "throughput_per_sec": batch_size / (statistics.mean(grpc_latencies) / 1000)
+                }
+            }
+        
+        return results
+    
+    def concurrent_benchmark(self, concurrent_users: int = 20, requests_per_user: int = 25) -> Dict:
+        """Concurrent single-row predictions; gRPC users share one multiplexed channel"""
+        samples = self.test_data['samples']
+        
+        def rest_user(user_id: int):
+            session = requests.Session()
+            latencies = []
+            for i in range(requests_per_user):
+                start_time = time.perf_counter()
+                response = session.post(f"{self.rest_url}/predict", json={"features": samples[i % len(samples)]})
+                end_time = time.perf_counter()
+                if response.status_code == 200:
+                    latencies.append((end_time - start_time) * 1000)
+            return latencies
+        
+        def grpc_user(user_id: int):
+            latencies = []
+            for i in range(requests_per_user):
+                start_time = time.perf_counter()
+                ok = self.grpc_predict([samples[i % len(samples)]])
+                end_time = time.perf_counter()
+                if ok:
+                    latencies.append((end_time - start_time) * 1000)
+            return latencies
+        
+        results = {}
+        for name, user in [("rest", rest_user), ("grpc", grpc_user)]:
+            start_time = time.perf_counter()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=concurrent_users) as executor:
+                futures = [executor.submit(user, i) for i in range(concurrent_users)]
+                all_latencies = []
+                for future in concurrent.futures.as_completed(futures):
+                    all_latencies.extend(future.result())
+            total_time = time.perf_counter() - start_time
+            
+            results[name] = {
+                "avg_latency_ms": statistics.mean(all_latencies),
+                "total_requests": len(all_latencies),
+                "total_time_sec": total_time,
+                "requests_per_sec": len(all_latencies) / total_time,
+                "concurrent_users": concurrent_users
+            }
+        
+        return results
+    
+    def streaming_benchmark(self, num_requests: int = 1000) -> Dict:
+        """Single-row predictions pipelined over one bidirectional gRPC stream.
+
+        The server works on up to GRPC_STREAM_WINDOW messages of the stream
+        at once and answers them in order.
+
+        Shed or failed messages come back with a non-zero status_code and do
+        not end the stream; only successful responses count as throughput.
+        """
+        samples = self.test_data['samples']
+        requests_to_send = [self.make_request([samples[i % len(samples)]]) for i in range(num_requests)]
+        
+        start_time = time.perf_counter()
+        successful, failed = 0, 0
+        for response in self.stub.PredictStream(iter(requests_to_send)):
+            if response.status_code == 0:
+                successful += 1
+            else:
+                failed += 1
+        total_time = time.perf_counter() - start_time
+        
+        return {
+            "total_requests": num_requests,
+            "successful_requests": successful,
+            "failed_requests": failed,
+            "total_time_sec": total_time,
+            "requests_per_sec": successful / total_time
+        }
+    
+    def run_full_benchmark(self):
+        """Run the REST vs gRPC suite"""
+        print("Starting REST vs gRPC benchmarks...")
+        self.wait_for_apis()
+        
+        results = {"timestamp": time.time()}
+        
+        print("  Running single request benchmark...")
+        results["single_requests"] = self.single_request_benchmark()
+        
+        print("  Running batch request benchmark...")
+        results["batch_requests"] = self.batch_request_benchmark()
+        
+        print("  Running concurrent request benchmark...")
+        results["concurrent_requests"] = self.concurrent_benchmark()
+        
+        print("  Running gRPC streaming benchmark...")
+        results["grpc_streaming"] = self.streaming_benchmark()
+        
+        with open('/app/results/grpc_benchmark_results.json', 'w') as f:
+            json.dump(results, f, indent=2)
+        
+        self.print_comparison(results)
+        return results
+    
+    def print_comparison(self, results: Dict):
+        """Print REST vs gRPC comparison"""
+        print("\n" + "="*60)
+        print("REST vs gRPC RESULTS (Python API)")
+        print("="*60)
+        
+        single = results["single_requests"]
+        print(f"\nSingle Request Latency:")
+        print(f"  REST: {single['rest']['avg_latency_ms']:.2f}ms (p99 {single['rest']['p99_latency_ms']:.2f}ms)")
+        print(f"  gRPC: {single['grpc']['avg_latency_ms']:.2f}ms (p99 {single['grpc']['p99_latency_ms']:.2f}ms)")
+        print(f"  Speedup: {single['rest']['avg_latency_ms'] / single['grpc']['avg_latency_ms']:.2f}x")
+        
+        concurrent_results = results["concurrent_requests"]
+        print(f"\nConcurrent Throughput:")
+        print(f"  REST: {concurrent_results['rest']['requests_per_sec']:.1f} req/sec")
+        print(f"  gRPC: {concurrent_results['grpc']['requests_per_sec']:.1f} req/sec")
+        print(f"  gRPC stream: {results['grpc_streaming']['requests_per_sec']:.1f} req/sec")
+        
+        largest_batch = max(results["batch_requests"], key=lambda k: int(k.split("_")[1]))
+        batch = results["batch_requests"][largest_batch]
+        print(f"\nBatch Processing ({largest_batch.split('_')[1]} items):")
+        print(f"  REST: {batch['rest']['throughput_per_sec']:.1f} items/sec")
+        print(f"  gRPC: {batch['grpc']['throughput_per_sec']:.1f} items/sec")
+
+if __name__ == "__main__":
+    benchmark = GRPCBenchmark()
+    benchmark.run_full_benchmark()
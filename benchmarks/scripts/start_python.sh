@@ -1,2 +1,3 @@
 cd ../python-api
-uvicorn main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+python -m grpc_tools.protoc -I proto --python_out=. --grpc_python_out=. proto/inference.proto
+python main.py
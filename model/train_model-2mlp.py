@@ -6,8 +6,10 @@ from sklearn.neural_network import MLPRegressor
 from sklearn.datasets import make_regression
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
+from sklearn.pipeline import Pipeline
 import pickle
 import onnx
+import onnxruntime as ort
 from skl2onnx import convert_sklearn
 from skl2onnx.common.data_types import FloatTensorType
 
@@ -34,14 +36,28 @@ with open('neural_network.pkl', 'wb') as f:
 
 # Convert to ONNX
 initial_type = [('float_input', FloatTensorType([None, 20]))]
-onnx_model = convert_sklearn(model, initial_types=initial_type)
+# Export scaler + model as one graph so clients send raw features and
+# scaling runs inside session.run
+pipeline = Pipeline([("scaler", scaler), ("model", model)])
+onnx_model = convert_sklearn(pipeline, initial_types=initial_type)
 
-# Save ONNX model
+# Parity check before writing anything the API loads: fused ONNX graph vs
+# the pickled (model, scaler) on raw features
+with open('neural_network.pkl', 'rb') as f:
+    pickled_model, pickled_scaler = pickle.load(f)
+session = ort.InferenceSession(onnx_model.SerializeToString())
+onnx_outputs = session.run(None, {'float_input': X_test.astype(np.float32)})[0].ravel()
+sklearn_outputs = pickled_model.predict(pickled_scaler.transform(X_test))
+max_abs_diff = np.max(np.abs(onnx_outputs - sklearn_outputs))
+print(f"ONNX vs sklearn max abs diff: {max_abs_diff:.6f}")
+np.testing.assert_allclose(onnx_outputs, sklearn_outputs, rtol=1e-3, atol=1e-2)
+
+# Save ONNX model only once it has passed the parity check
 with open('linear_regression.onnx', 'wb') as f:  # Keep same name for compatibility
     f.write(onnx_model.SerializeToString())
 
 # Create test data with 20 features
-test_samples = X_test_scaled[:10].tolist()
+test_samples = X_test[:10].tolist()  # Raw features, the graph scales them
 expected_outputs = model.predict(X_test_scaled[:10]).tolist()
 
 test_data = {
@@ -1,10 +1,13 @@
 ### Trains intentionally slow random forest model
 
 import numpy as np
+import copy
+import hashlib
 import json
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.datasets import make_regression
 from sklearn.model_selection import train_test_split
+from sklearn.metrics import r2_score
 import pickle
 import onnx
 from skl2onnx import convert_sklearn
@@ -53,6 +56,41 @@ test_data = {
 with open('test_data.json', 'w') as f:
     json.dump(test_data, f, indent=2)
 
+# Export ordered tree subsets for graceful degradation under load.
+# Subset k is the first k trees, so every level is a prefix of the full forest.
+total_trees = len(model.estimators_)
+fidelity_levels = []
+for n_trees in [n for n in [25, 50, 100] if n < total_trees] + [total_trees]:
+    if n_trees == total_trees:
+        subset, filename = model, 'linear_regression.onnx'
+    else:
+        subset = copy.copy(model)
+        subset.estimators_ = model.estimators_[:n_trees]
+        subset.n_estimators = n_trees
+        filename = f'forest_{n_trees}.onnx'
+        with open(filename, 'wb') as f:
+            f.write(convert_sklearn(subset, initial_types=initial_type).SerializeToString())
+    
+    subset_expected = subset.predict(np.array(test_samples))
+    fidelity_levels.append({
+        "file": filename,
+        "trees": n_trees,
+        "fidelity": n_trees / total_trees,
+        "test_r2": r2_score(y_test, subset.predict(X_test)),
+        "test_data_mae": float(np.mean(np.abs(subset_expected - np.array(expected_outputs)))),
+    })
+    print(f"  {n_trees:>3} trees: test R2 {fidelity_levels[-1]['test_r2']:.4f}, "
+          f"MAE vs full forest on test_data.json {fidelity_levels[-1]['test_data_mae']:.4f}")
+
+fidelity_manifest = {
+    # Lets the API ignore this manifest if a different model is exported later
+    "full_model_id": hashlib.sha256(onnx_model.SerializeToString()).hexdigest()[:16],
+    "levels": fidelity_levels
+}
+
+with open('fidelity_levels.json', 'w') as f:
+    json.dump(fidelity_manifest, f, indent=2)
+
 # Model info
 model_info = {
     "input_shape": [100],
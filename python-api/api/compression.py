@@ -0,0 +1,204 @@
+import gzip
+import zlib
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import PlainTextResponse
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZSTD_INPUT_CHUNK = 256
+
+def supported_encodings() -> list:
+    """Encodings in server preference order"""
+    return ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred encoding the client accepts, honouring q=0 exclusions"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+
+    for encoding in supported_encodings():
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > 0:
+            return encoding
+    return None
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, zstd_level: int = 3) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=zstd_level).compress(body)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+def decompress(body: bytes, encoding: str, max_size: int) -> bytes:
+    if encoding == "gzip":
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        data = decoder.decompress(body, max_size + 1)
+        if len(data) <= max_size and not decoder.eof:
+            raise ValueError("Truncated gzip body")
+    elif encoding == "zstd" and zstandard is not None:
+        # decompressobj has no output cap, so feed small input slices and
+        # stop as soon as the limit is passed (one zstd byte can expand ~32K-fold)
+        decoder = zstandard.ZstdDecompressor().decompressobj()
+        chunks, size = [], 0
+        for offset in range(0, len(body), ZSTD_INPUT_CHUNK):
+            chunk = decoder.decompress(body[offset:offset + ZSTD_INPUT_CHUNK])
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > max_size or decoder.eof:
+                break
+        data = b"".join(chunks)
+        if len(data) <= max_size and not decoder.eof:
+            raise ValueError("Truncated zstd body")
+    else:
+        raise ValueError(f"Unsupported encoding: {encoding}")
+    if len(data) > max_size:
+        raise OverflowError(f"Decompressed body exceeds {max_size} bytes")
+    return data
+
+class CompressionMiddleware:
+    """Negotiated gzip/zstd for request and response bodies.
+
+    Requests with `Content-Encoding: gzip|zstd` are decoded before routing.
+    Responses of at least `minimum_size` bytes are encoded with the best
+    encoding from `Accept-Encoding`; smaller ones are sent as-is because the
+    framing overhead outweighs the saving on tiny JSON bodies.
+
+    Bodies of at least `thread_min_size` bytes are (de)compressed in a worker
+    thread, since the same event loop also serves gRPC and admission control.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        max_decompressed_size: int = 64 * 1024 * 1024,
+        thread_min_size: int = 16 * 1024,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self.max_decompressed_size = max_decompressed_size
+        self.thread_min_size = thread_min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_encoding = headers.get("content-encoding", "identity").strip().lower()
+        if content_encoding != "identity":
+            if content_encoding not in supported_encodings():
+                response = PlainTextResponse(
+                    f"Unsupported Content-Encoding: {content_encoding}", status_code=415
+                )
+                await response(scope, receive, send)
+                return
+
+            body = await self._read_body(receive)
+            try:
+                body = await self._offload(
+                    len(body), decompress, body, content_encoding, self.max_decompressed_size
+                )
+            except OverflowError as e:
+                await PlainTextResponse(str(e), status_code=413)(scope, receive, send)
+                return
+            except Exception:
+                response = PlainTextResponse("Malformed compressed request body", status_code=400)
+                await response(scope, receive, send)
+                return
+
+            scope = dict(scope)
+            scope["headers"] = [
+                (k, v) for k, v in scope["headers"]
+                if k not in (b"content-encoding", b"content-length")
+            ] + [(b"content-length", str(len(body)).encode())]
+            receive = self._replay(body, receive)
+
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, self._compressing_send(send, encoding))
+
+    async def _offload(self, size: int, fn, *args):
+        if size >= self.thread_min_size:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _replay(body: bytes, receive):
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
+
+    def _compressing_send(self, send, encoding: str):
+        start_message = None
+        chunks = []
+
+        async def compressing_send(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = MutableHeaders(raw=list(start_message.get("headers", [])))
+            if len(body) >= self.minimum_size and "content-encoding" not in headers:
+                body = await self._offload(
+                    len(body), compress, body, encoding, self.gzip_level, self.zstd_level
+                )
+                headers["content-encoding"] = encoding
+                headers["content-length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+            start_message = {**start_message, "headers": headers.raw}
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        return compressing_send
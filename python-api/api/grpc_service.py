@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import grpc
+import numpy as np
+
+import inference_pb2
+import inference_pb2_grpc
+from core import config
+from core.admission import AdmissionRejected, admission_controller
+from core.degradation import record_served, select_level
+from core.inference import inference_engine
+
+# Admission rejections mapped onto the closest gRPC status
+REJECTION_CODES = {
+    429: grpc.StatusCode.RESOURCE_EXHAUSTED,
+    503: grpc.StatusCode.UNAVAILABLE,
+}
+
+def decode_tensor(tensor) -> np.ndarray:
+    shape = tuple(tensor.shape)
+    if len(shape) != 2:
+        raise ValueError(f"features must have shape [rows, n_features], got {list(shape)}")
+    expected_bytes = shape[0] * shape[1] * 4
+    if len(tensor.data) != expected_bytes:
+        raise ValueError(f"features data is {len(tensor.data)} bytes, expected {expected_bytes}")
+    return np.frombuffer(tensor.data, dtype="<f4").reshape(shape)
+
+def encode_tensor(values: np.ndarray):
+    values = np.ascontiguousarray(values, dtype="<f4")
+    return inference_pb2.Tensor(shape=list(values.shape), data=values.tobytes())
+
+class PredictError(Exception):
+    def __init__(self, code: grpc.StatusCode, detail: str, retry_after: int = 0):
+        super().__init__(detail)
+        self.code = code
+        self.detail = detail
+        self.retry_after = retry_after
+
+class InferenceServicer(inference_pb2_grpc.InferenceServicer):
+    """gRPC front end sharing the REST API's engine and admission control.
+
+    Unary Predict fails the RPC on error. PredictStream instead answers a
+    failed message with a response carrying `status_code`/`error` and keeps
+    serving the rest of the stream. Stream messages are processed
+    concurrently, up to `stream_window` at a time, and answered in order.
+    """
+
+    def __init__(self, stream_window: int = config.GRPC_STREAM_WINDOW):
+        self.stream_window = stream_window
+
+    async def _predict(self, request, context):
+        try:
+            input_data = decode_tensor(request.features)
+        except ValueError as e:
+            raise PredictError(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        deadline = None
+        time_remaining = context.time_remaining()
+        if time_remaining is not None:
+            deadline = time.monotonic() + time_remaining
+
+        level = select_level()
+        try:
+            predictions = await admission_controller.run(deadline, inference_engine.predict_array, input_data, level)
+        except AdmissionRejected as e:
+            code = REJECTION_CODES.get(e.status_code, grpc.StatusCode.UNAVAILABLE)
+            raise PredictError(code, e.detail, e.retry_after)
+        except Exception as e:
+            raise PredictError(grpc.StatusCode.INTERNAL, str(e))
+        record_served(level)
+
+        return inference_pb2.PredictResponse(
+            predictions=encode_tensor(predictions),
+            fidelity=inference_engine.fidelity(level),
+        )
+
+    async def Predict(self, request, context):
+        try:
+            return await self._predict(request, context)
+        except PredictError as e:
+            if e.retry_after:
+                context.set_trailing_metadata((("retry-after", str(e.retry_after)),))
+            await context.abort(e.code, e.detail)
+
+    async def _predict_message(self, request, context):
+        try:
+            return await self._predict(request, context)
+        except PredictError as e:
+            return inference_pb2.PredictResponse(
+                status_code=e.code.value[0],
+                error=e.detail,
+                retry_after_s=e.retry_after,
+            )
+
+    async def PredictStream(self, request_iterator, context):
+        window = asyncio.Semaphore(self.stream_window)
+        pending = asyncio.Queue()
+
+        async def read_requests():
+            try:
+                async for request in request_iterator:
+                    await window.acquire()
+                    pending.put_nowait(asyncio.ensure_future(self._predict_message(request, context)))
+            finally:
+                pending.put_nowait(None)
+
+        reader = asyncio.ensure_future(read_requests())
+        try:
+            while True:
+                task = await pending.get()
+                if task is None:
+                    break
+                response = await task
+                window.release()
+                yield response
+            # Surface a failed request iterator instead of ending the stream cleanly
+            await reader
+        finally:
+            reader.cancel()
+            while not pending.empty():
+                task = pending.get_nowait()
+                if task is not None:
+                    task.cancel()
+
+async def start_grpc_server() -> grpc.aio.Server:
+    server = grpc.aio.server(options=[
+        ("grpc.max_receive_message_length", config.GRPC_MAX_MESSAGE_BYTES),
+        ("grpc.max_send_message_length", config.GRPC_MAX_MESSAGE_BYTES),
+    ])
+    inference_pb2_grpc.add_InferenceServicer_to_server(InferenceServicer(config.GRPC_STREAM_WINDOW), server)
+    server.add_insecure_port(f"{config.HOST}:{config.GRPC_PORT}")
+    await server.start()
+    print(f"gRPC server listening on {config.HOST}:{config.GRPC_PORT}")
+    return server
@@ -0,0 +1,29 @@
+from starlette.responses import PlainTextResponse
+
+class ConcurrencyLimitMiddleware:
+    """Answer 503 once `limit` HTTP requests are already in progress.
+
+    Stands in for uvicorn's `limit_concurrency` under servers that lack one
+    (hypercorn). With HTTP/2 every stream counts as a request.
+    """
+
+    def __init__(self, app, limit: int):
+        self.app = app
+        self.limit = limit
+        self.active = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.active >= self.limit:
+            response = PlainTextResponse("Service Unavailable", status_code=503)
+            await response(scope, receive, send)
+            return
+
+        self.active += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.active -= 1
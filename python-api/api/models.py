@@ -9,9 +9,11 @@ class BatchPredictRequest(BaseModel):
 
 class PredictResponse(BaseModel):
     prediction: float
+    fidelity: float = 1.0
 
 class BatchPredictResponse(BaseModel):
     predictions: List[float]
+    fidelity: float = 1.0
 
 class HealthResponse(BaseModel):
     model_config = ConfigDict(protected_namespaces=())
@@ -1,26 +1,59 @@
-from fastapi import APIRouter, HTTPException
+import math
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
 from api.models import (
     PredictRequest, PredictResponse,
     BatchPredictRequest, BatchPredictResponse,
     HealthResponse, ModelInfoResponse
 )
+from core.admission import AdmissionRejected, admission_controller
+from core.cache import prediction_cache
+from core.degradation import degradation_controller, record_served, select_level
 from core.inference import inference_engine
 
 router = APIRouter()
 
+async def request_deadline(x_deadline_ms: Optional[float] = Header(None)) -> Optional[float]:
+    """Turn the relative X-Deadline-Ms budget into an absolute monotonic deadline"""
+    if x_deadline_ms is None:
+        return None
+    if not math.isfinite(x_deadline_ms) or x_deadline_ms < 0:
+        raise HTTPException(status_code=400, detail="X-Deadline-Ms must be a finite, non-negative number")
+    return time.monotonic() + x_deadline_ms / 1000
+
+async def run_admitted(deadline: Optional[float], fn, *args):
+    try:
+        return await admission_controller.run(deadline, fn, *args)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
 @router.post("/predict", response_model=PredictResponse)
-async def predict(request: PredictRequest):
+async def predict(request: PredictRequest, deadline: Optional[float] = Depends(request_deadline)):
     try:
-        prediction = inference_engine.predict_single(request.features)
-        return PredictResponse(prediction=prediction)
+        level = select_level()
+        prediction = await run_admitted(deadline, inference_engine.predict_single, request.features, level)
+        record_served(level)
+        return PredictResponse(prediction=prediction, fidelity=inference_engine.fidelity(level))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/predict/batch", response_model=BatchPredictResponse)
-async def predict_batch(request: BatchPredictRequest):
+async def predict_batch(request: BatchPredictRequest, deadline: Optional[float] = Depends(request_deadline)):
     try:
-        predictions = inference_engine.predict_batch(request.features)
-        return BatchPredictResponse(predictions=predictions)
+        level = select_level()
+        predictions = await run_admitted(deadline, inference_engine.predict_batch, request.features, level)
+        record_served(level)
+        return BatchPredictResponse(predictions=predictions, fidelity=inference_engine.fidelity(level))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -31,4 +64,21 @@ async def health():
 @router.get("/model/info", response_model=ModelInfoResponse)
 async def model_info():
     info = inference_engine.get_model_info()
-    return ModelInfoResponse(**info)
\ No newline at end of file
+    return ModelInfoResponse(**info)
+
+@router.get("/admission/stats")
+async def admission_stats():
+    return admission_controller.stats()
+
+@router.get("/cache/stats")
+async def cache_stats():
+    if prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_cache.stats()}
+
+@router.get("/model/fidelity")
+async def model_fidelity():
+    return {
+        "levels": [level.describe() for level in inference_engine.levels],
+        "degradation": degradation_controller.stats() if degradation_controller else None,
+    }
@@ -0,0 +1,172 @@
+import asyncio
+import functools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, nullcontext
+from typing import Optional
+
+from core import config
+from core.limiter import AdaptiveLimiter, concurrency_limiter
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Bounds in-flight inference and sheds load instead of queueing forever.
+
+    Requests beyond `limit` wait in a bounded FIFO queue. A request is rejected
+    straight away when the queue is full, and dropped when it has waited longer
+    than `queue_timeout_ms` or past its own deadline before reaching inference.
+    With a `limiter`, `limit` follows its adaptive value instead of staying fixed.
+
+    Admitted work runs on a dedicated executor with one thread per possible
+    slot, so nothing admitted ever waits for a thread outside this queue.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        max_queue: int,
+        queue_timeout_ms: float,
+        retry_after: int,
+        limiter: Optional[AdaptiveLimiter] = None,
+    ):
+        self._limit = limit
+        self.limiter = limiter
+        self.max_queue = max_queue
+        self.queue_timeout_ms = queue_timeout_ms
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.rejected = 0
+        self.expired = 0
+        self._waiters = deque()
+        max_limit = limiter.max_limit if limiter is not None else limit
+        self.executor = ThreadPoolExecutor(max_workers=max_limit, thread_name_prefix="inference")
+
+    @property
+    def limit(self) -> int:
+        if self.limiter is not None:
+            return self.limiter.limit
+        return self._limit
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _reject(self, status_code: int, detail: str) -> AdmissionRejected:
+        return AdmissionRejected(status_code, detail, self.retry_after)
+
+    def _wake_waiters(self):
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def _acquire(self, deadline: Optional[float]):
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise self._reject(429, "Too many queued requests")
+
+        timeout = self.queue_timeout_ms / 1000
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+        if timeout <= 0:
+            self.expired += 1
+            raise self._reject(503, "Request deadline exceeded before inference")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+            self.expired += 1
+            raise self._reject(503, "Timed out waiting for an inference slot")
+        except asyncio.CancelledError:
+            # Client went away while queued; hand back a slot we may already own
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    @asynccontextmanager
+    async def admit(self, deadline: Optional[float] = None):
+        """Hold an inference slot for the duration of the block.
+
+        `deadline` is an absolute `time.monotonic()` value, or None for no deadline.
+        """
+        await self._acquire(deadline)
+        try:
+            if deadline is not None and time.monotonic() >= deadline:
+                self.expired += 1
+                raise self._reject(503, "Request deadline exceeded before inference")
+            yield
+        finally:
+            self._release()
+
+    async def run(self, deadline: Optional[float], fn, *args):
+        """Run `fn(*args)` on the inference executor while holding a slot.
+
+        If the caller is cancelled mid-inference, the slot is kept until the
+        thread actually finishes, so cancelled requests still count against
+        the in-flight limit. With a limiter, the whole call is one latency sample.
+        """
+        measure = self.limiter.measure if self.limiter is not None else nullcontext
+
+        def call():
+            with measure():
+                return fn(*args)
+
+        async with self.admit(deadline):
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, call)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                while not future.done():
+                    try:
+                        await asyncio.wait([future])
+                    except asyncio.CancelledError:
+                        pass
+                raise
+
+    def stats(self) -> dict:
+        stats = {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "expired": self.expired,
+        }
+        if self.limiter is not None:
+            stats["adaptive"] = self.limiter.stats()
+        return stats
+
+admission_controller = AdmissionController(
+    limit=config.MAX_IN_FLIGHT,
+    max_queue=config.MAX_QUEUE,
+    queue_timeout_ms=config.QUEUE_TIMEOUT_MS,
+    retry_after=config.RETRY_AFTER_SECONDS,
+    limiter=concurrency_limiter,
+)
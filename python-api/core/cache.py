@@ -0,0 +1,324 @@
+import hashlib
+import math
+import sqlite3
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from core import config
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+def prediction_key(model_id: str, row: np.ndarray) -> str:
+    digest = hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest()
+    return f"pred:{model_id}:{digest}"
+
+def encode_value(value: float) -> bytes:
+    return struct.pack("<d", value)
+
+def decode_value(data: bytes) -> float:
+    return struct.unpack("<d", data)[0]
+
+# How often the memory and file backends delete expired entries on write
+SWEEP_INTERVAL_S = 60.0
+
+class CacheBackend(ABC):
+    """Shared (L2) store interface. Values are opaque bytes; absent keys are misses."""
+
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        ...
+
+    @abstractmethod
+    def set_many(self, items: Dict[str, bytes], ttl_s: int):
+        ...
+
+class InMemoryBackend(CacheBackend):
+    """Process-local stand-in for a shared backend, for tests and single-node runs"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + SWEEP_INTERVAL_S
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        now = time.monotonic()
+        with self._lock:
+            found = {}
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is not None and entry[1] > now:
+                    found[key] = entry[0]
+            return found
+
+    def set_many(self, items: Dict[str, bytes], ttl_s: int):
+        now = time.monotonic()
+        expires = now + ttl_s
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = (value, expires)
+            if now >= self._next_sweep:
+                self._data = {k: entry for k, entry in self._data.items() if entry[1] > now}
+                self._next_sweep = now + SWEEP_INTERVAL_S
+
+class FileBackend(CacheBackend):
+    """SQLite file shared by every worker process on one host"""
+
+    # Stay under SQLite's bound-parameter limit
+    CHUNK = 500
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)")
+        self._lock = threading.Lock()
+        self._next_sweep = time.time() + SWEEP_INTERVAL_S
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        now = time.time()
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), self.CHUNK):
+                chunk = keys[i:i + self.CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({placeholders}) AND expires > ?",
+                    (*chunk, now),
+                )
+                found.update(rows)
+        return found
+
+    def set_many(self, items: Dict[str, bytes], ttl_s: int):
+        now = time.time()
+        expires = now + ttl_s
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                [(key, value, expires) for key, value in items.items()],
+            )
+            if now >= self._next_sweep:
+                self._conn.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+                self._next_sweep = now + SWEEP_INTERVAL_S
+
+class RedisBackend(CacheBackend):
+    """Any Redis-protocol server; bulk operations are one round trip each"""
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise ImportError("The redis package is required for PREDICTION_CACHE=redis")
+        self.client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.05)
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        values = self.client.mget(keys)
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def set_many(self, items: Dict[str, bytes], ttl_s: int):
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(key, value, ex=ttl_s)
+        pipe.execute()
+
+class LocalCache:
+    """Thread-safe LRU with per-entry expiry (the L1 tier)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[float]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: float, ttl_s: float):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl_s)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+class PredictionCache:
+    """Two-tier prediction cache with singleflight miss handling.
+
+    Lookups go L1, then one bulk call to L2 for whatever L1 missed. Keys still
+    missing are computed once even when several threads ask concurrently: the
+    first caller computes, later callers wait on its result.
+
+    Caching rules:
+    - finite predictions go to L1 and L2;
+    - non-finite predictions (from NaN/inf features) are negative results,
+      kept in L1 for `negative_ttl_s` only and never shared through L2;
+    - inference errors are never cached; they propagate to every waiter;
+    - L2 errors count as misses and bypass L2 for `l2_error_backoff_s`.
+    """
+
+    def __init__(
+        self,
+        l1: LocalCache,
+        l2: Optional[CacheBackend],
+        l1_ttl_s: float,
+        l2_ttl_s: int,
+        negative_ttl_s: float,
+        l2_error_backoff_s: float,
+    ):
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_ttl_s = l1_ttl_s
+        self.l2_ttl_s = l2_ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.l2_error_backoff_s = l2_error_backoff_s
+        self._l2_bypass_until = 0.0
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.counters = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "coalesced": 0, "l2_errors": 0}
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    def _l2_available(self) -> bool:
+        return self.l2 is not None and time.monotonic() >= self._l2_bypass_until
+
+    def _l2_failed(self, e: Exception):
+        self._count("l2_errors")
+        self._l2_bypass_until = time.monotonic() + self.l2_error_backoff_s
+        print(f"L2 cache error, bypassing for {self.l2_error_backoff_s}s: {e}")
+
+    def _l2_get(self, keys: List[str]) -> Dict[str, float]:
+        if not keys or not self._l2_available():
+            return {}
+        try:
+            return {key: decode_value(value) for key, value in self.l2.get_many(keys).items()}
+        except Exception as e:
+            self._l2_failed(e)
+            return {}
+
+    def _l2_set(self, items: Dict[str, float]):
+        if not items or not self._l2_available():
+            return
+        try:
+            self.l2.set_many({key: encode_value(value) for key, value in items.items()}, self.l2_ttl_s)
+        except Exception as e:
+            self._l2_failed(e)
+
+    def _store(self, values: Dict[str, float]):
+        shared = {}
+        for key, value in values.items():
+            if math.isfinite(value):
+                self.l1.set(key, value, self.l1_ttl_s)
+                shared[key] = value
+            else:
+                self.l1.set(key, value, self.negative_ttl_s)
+        self._l2_set(shared)
+
+    def get_or_compute(self, keys: List[str], compute: Callable[[List[int]], np.ndarray]) -> List[float]:
+        """Resolve one value per key, calling `compute(row_indices)` only for true misses"""
+        results: List[Optional[float]] = [None] * len(keys)
+        pending: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            value = self.l1.get(key)
+            if value is None:
+                pending.setdefault(key, []).append(i)
+            else:
+                results[i] = value
+        self._count("l1_hits", len(keys) - sum(len(rows) for rows in pending.values()))
+
+        l2_values = self._l2_get(list(pending))
+        for key, value in l2_values.items():
+            self.l1.set(key, value, self.l1_ttl_s)
+            for i in pending.pop(key):
+                results[i] = value
+        self._count("l2_hits", len(l2_values))
+
+        if pending:
+            leading, following = {}, {}
+            with self._lock:
+                for key in pending:
+                    future = self._inflight.get(key)
+                    if future is None:
+                        future = self._inflight[key] = Future()
+                        leading[key] = future
+                    else:
+                        following[key] = future
+                self.counters["misses"] += len(leading)
+                self.counters["coalesced"] += len(following)
+
+            if leading:
+                try:
+                    lead_keys = list(leading)
+                    predictions = compute([pending[key][0] for key in lead_keys])
+                    computed = {key: float(value) for key, value in zip(lead_keys, predictions)}
+                    self._store(computed)
+                    for key, future in leading.items():
+                        future.set_result(computed[key])
+                except Exception as e:
+                    for future in leading.values():
+                        if not future.done():
+                            future.set_exception(e)
+                    raise
+                finally:
+                    with self._lock:
+                        for key in leading:
+                            self._inflight.pop(key, None)
+
+            for key, future in {**leading, **following}.items():
+                value = future.result()
+                for i in pending[key]:
+                    results[i] = value
+
+        return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.counters)
+        stats["l1_size"] = len(self.l1)
+        stats["l2"] = type(self.l2).__name__ if self.l2 is not None else None
+        stats["l2_bypassed"] = self.l2 is not None and not self._l2_available()
+        return stats
+
+def create_prediction_cache() -> Optional[PredictionCache]:
+    backends = {
+        "local": lambda: None,
+        "memory": InMemoryBackend,
+        "file": lambda: FileBackend(config.CACHE_FILE),
+        "redis": lambda: RedisBackend(config.REDIS_URL),
+    }
+    if config.PREDICTION_CACHE == "off":
+        return None
+    if config.PREDICTION_CACHE not in backends:
+        raise ValueError(
+            f"Unknown PREDICTION_CACHE={config.PREDICTION_CACHE!r}, "
+            f"expected one of: off, {', '.join(backends)}"
+        )
+    return PredictionCache(
+        l1=LocalCache(config.L1_CACHE_SIZE),
+        l2=backends[config.PREDICTION_CACHE](),
+        l1_ttl_s=config.L1_CACHE_TTL_S,
+        l2_ttl_s=config.L2_CACHE_TTL_S,
+        negative_ttl_s=config.NEGATIVE_CACHE_TTL_S,
+        l2_error_backoff_s=config.L2_ERROR_BACKOFF_S,
+    )
+
+prediction_cache = create_prediction_cache()
@@ -0,0 +1,52 @@
+import os
+
+# Admission control
+MAX_IN_FLIGHT = int(os.getenv("MAX_IN_FLIGHT", "4"))
+MAX_QUEUE = int(os.getenv("MAX_QUEUE", "64"))
+QUEUE_TIMEOUT_MS = float(os.getenv("QUEUE_TIMEOUT_MS", "1000"))
+RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", "1"))
+
+# Adaptive concurrency (AIMD on measured latency of admitted inference calls)
+ADAPTIVE_CONCURRENCY = os.getenv("ADAPTIVE_CONCURRENCY", "true").lower() == "true"
+TARGET_LATENCY_MS = float(os.getenv("TARGET_LATENCY_MS", "50"))
+MIN_IN_FLIGHT = int(os.getenv("MIN_IN_FLIGHT", "1"))
+ADAPTIVE_MAX_IN_FLIGHT = int(os.getenv("ADAPTIVE_MAX_IN_FLIGHT", "64"))
+LIMIT_BACKOFF_RATIO = float(os.getenv("LIMIT_BACKOFF_RATIO", "0.9"))
+
+# Request/response compression
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", "3"))
+MAX_DECOMPRESSED_BYTES = int(os.getenv("MAX_DECOMPRESSED_BYTES", str(64 * 1024 * 1024)))
+COMPRESSION_THREAD_MIN_SIZE = int(os.getenv("COMPRESSION_THREAD_MIN_SIZE", str(16 * 1024)))
+
+# Server: "uvicorn" (HTTP/1.1) or "hypercorn" (HTTP/1.1 + h2c)
+SERVER = os.getenv("SERVER", "uvicorn").lower()
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+KEEP_ALIVE_TIMEOUT_S = int(os.getenv("KEEP_ALIVE_TIMEOUT_S", "30"))
+BACKLOG = int(os.getenv("BACKLOG", "2048"))
+LIMIT_CONCURRENCY = int(os.getenv("LIMIT_CONCURRENCY", "0")) or None
+H2_MAX_CONCURRENT_STREAMS = int(os.getenv("H2_MAX_CONCURRENT_STREAMS", "100"))
+
+# gRPC
+GRPC_ENABLED = os.getenv("GRPC_ENABLED", "true").lower() == "true"
+GRPC_PORT = int(os.getenv("GRPC_PORT", "50051"))
+GRPC_MAX_MESSAGE_BYTES = int(os.getenv("GRPC_MAX_MESSAGE_BYTES", str(64 * 1024 * 1024)))
+GRPC_STREAM_WINDOW = int(os.getenv("GRPC_STREAM_WINDOW", "16"))
+
+# Prediction cache: "off", "local" (L1 only), "memory", "file" or "redis" (L1 + shared L2)
+PREDICTION_CACHE = os.getenv("PREDICTION_CACHE", "off").lower()
+L1_CACHE_SIZE = int(os.getenv("L1_CACHE_SIZE", "10000"))
+L1_CACHE_TTL_S = float(os.getenv("L1_CACHE_TTL_S", "60"))
+L2_CACHE_TTL_S = int(os.getenv("L2_CACHE_TTL_S", "3600"))
+NEGATIVE_CACHE_TTL_S = float(os.getenv("NEGATIVE_CACHE_TTL_S", "5"))
+L2_ERROR_BACKOFF_S = float(os.getenv("L2_ERROR_BACKOFF_S", "10"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+CACHE_FILE = os.getenv("CACHE_FILE", "/tmp/prediction_cache.sqlite3")
+
+# Graceful degradation across fidelity levels (fidelity_levels.json)
+DEGRADATION_ENABLED = os.getenv("DEGRADATION_ENABLED", "true").lower() == "true"
+DEGRADE_QUEUE_DEPTH = int(os.getenv("DEGRADE_QUEUE_DEPTH", "16"))
+DEGRADE_LATENCY_MS = float(os.getenv("DEGRADE_LATENCY_MS", "100"))
+DEGRADE_COOLDOWN_S = float(os.getenv("DEGRADE_COOLDOWN_S", "2"))
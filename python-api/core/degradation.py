@@ -0,0 +1,85 @@
+import time
+from typing import Optional
+
+from core import config
+from core.admission import AdmissionController, admission_controller
+from core.inference import inference_engine
+
+class DegradationController:
+    """Chooses which model fidelity level serves the next request.
+
+    Steps down one level while the admission queue or the engine's smoothed
+    `session.run` latency is over its threshold, and back up once both fall
+    below half of it. Level changes are at least `cooldown_s` apart so a
+    cheaper level has time to drain the queue before being re-evaluated.
+    """
+
+    def __init__(
+        self,
+        num_levels: int,
+        admission: AdmissionController,
+        engine,
+        queue_depth_threshold: int,
+        latency_threshold_ms: float,
+        cooldown_s: float,
+    ):
+        self.num_levels = num_levels
+        self.admission = admission
+        self.engine = engine
+        self.queue_depth_threshold = queue_depth_threshold
+        self.latency_threshold_ms = latency_threshold_ms
+        self.cooldown_s = cooldown_s
+        self.level = num_levels - 1
+        self.degraded_requests = 0
+        self._changed_at = 0.0
+
+    def select(self) -> int:
+        now = time.monotonic()
+        if now - self._changed_at >= self.cooldown_s:
+            queued = self.admission.queued
+            latency_ms = self.engine.latency_ewma_ms
+            overloaded = queued > self.queue_depth_threshold or latency_ms > self.latency_threshold_ms
+            relaxed = (
+                queued <= self.queue_depth_threshold / 2
+                and latency_ms <= self.latency_threshold_ms / 2
+            )
+            if overloaded and self.level > 0:
+                self.level -= 1
+                self._changed_at = now
+                print(f"Load high (queued={queued}, latency={latency_ms:.1f}ms), degrading to level {self.level}")
+            elif relaxed and self.level < self.num_levels - 1:
+                self.level += 1
+                self._changed_at = now
+                print(f"Load normal, restoring to level {self.level}")
+        return self.level
+
+    def record_served(self, level: int):
+        """Count a request that was actually served, after admission"""
+        if level < self.num_levels - 1:
+            self.degraded_requests += 1
+
+    def stats(self) -> dict:
+        return {
+            "level": self.level,
+            "num_levels": self.num_levels,
+            "degraded_requests": self.degraded_requests,
+        }
+
+degradation_controller = DegradationController(
+    num_levels=len(inference_engine.levels),
+    admission=admission_controller,
+    engine=inference_engine,
+    queue_depth_threshold=config.DEGRADE_QUEUE_DEPTH,
+    latency_threshold_ms=config.DEGRADE_LATENCY_MS,
+    cooldown_s=config.DEGRADE_COOLDOWN_S,
+) if config.DEGRADATION_ENABLED and len(inference_engine.levels) > 1 else None
+
+def select_level() -> Optional[int]:
+    """Fidelity level for the next request, None meaning the full model"""
+    if degradation_controller is None:
+        return None
+    return degradation_controller.select()
+
+def record_served(level: Optional[int]):
+    if degradation_controller is not None and level is not None:
+        degradation_controller.record_served(level)
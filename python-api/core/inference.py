@@ -1,11 +1,43 @@
 import onnxruntime as ort
 import numpy as np
+import hashlib
 import json
 import os
-from typing import List
+import threading
+import time
+from typing import List, Optional
+
+from core import config
+from core.cache import PredictionCache, prediction_cache, prediction_key
+
+class ModelLevel:
+    """One servable variant of the model; `fidelity` is its share of the full model"""
+    
+    def __init__(self, session: ort.InferenceSession, model_id: str, fidelity: float = 1.0, metrics: Optional[dict] = None):
+        self.session = session
+        self.model_id = model_id
+        self.fidelity = fidelity
+        self.metrics = metrics or {}
+    
+    def describe(self) -> dict:
+        return {"fidelity": self.fidelity, "model_id": self.model_id, **self.metrics}
+
+def file_model_id(path: str) -> str:
+    # Cache keys are scoped to the exact model bytes so replicas never mix models
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
 
 class ONNXInferenceEngine:
-    def __init__(self, model_path: str):
+    def __init__(
+        self,
+        model_path: str,
+        cache: Optional[PredictionCache] = None,
+        load_fidelity_levels: bool = True,
+    ):
+        self.cache = cache
+        # Smoothed session.run latency, read by the degradation controller
+        self.latency_ewma_ms = 0.0
+        self._latency_lock = threading.Lock()
         # Handle different path scenarios
         possible_paths = [
             model_path,
@@ -27,6 +59,13 @@ class ONNXInferenceEngine:
         self.session = ort.InferenceSession(onnx_path)
         self.input_name = self.session.get_inputs()[0].name
         self.output_name = self.session.get_outputs()[0].name
+        self.model_id = file_model_id(onnx_path)
+        
+        # Reduced-fidelity variants (smallest first), the full model is always last.
+        # They are only loaded when something will serve them.
+        self.levels = [ModelLevel(self.session, self.model_id)]
+        if load_fidelity_levels:
+            self._load_fidelity_levels(onnx_path)
         
         # Load model info - try different paths
         info_paths = [
@@ -50,15 +89,81 @@ class ONNXInferenceEngine:
             }
             print("Using default model info")
     
-    def predict_single(self, features: List[float]) -> float:
+    def _load_fidelity_levels(self, onnx_path: str):
+        """Load the subset models listed in fidelity_levels.json next to the model.
+        
+        Reduced-fidelity levels are optional: a bad manifest or level file is
+        logged and skipped, and the full model keeps serving.
+        """
+        model_dir = os.path.dirname(onnx_path)
+        manifest_path = os.path.join(model_dir, 'fidelity_levels.json')
+        if not os.path.exists(manifest_path):
+            return
+        
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            entries = sorted(manifest["levels"], key=lambda entry: entry["fidelity"])
+        except Exception as e:
+            print(f"Ignoring {manifest_path}: could not read manifest: {e}")
+            return
+        if manifest.get("full_model_id") != self.model_id:
+            print(f"Ignoring {manifest_path}: it was written for a different model")
+            return
+        
+        levels = []
+        for entry in entries:
+            try:
+                metrics = {k: v for k, v in entry.items() if k not in ("file", "fidelity")}
+                if entry["fidelity"] >= 1.0:
+                    self.levels[-1].metrics = metrics
+                    continue
+                path = os.path.join(model_dir, entry["file"])
+                levels.append(ModelLevel(ort.InferenceSession(path), file_model_id(path), entry["fidelity"], metrics))
+            except Exception as e:
+                print(f"Skipping fidelity level {entry.get('file', entry)}: {e}")
+        
+        self.levels = levels + self.levels
+        print(f"Loaded {len(levels)} reduced-fidelity model levels from {manifest_path}")
+    
+    def _level(self, level: Optional[int]) -> ModelLevel:
+        return self.levels[-1] if level is None else self.levels[level]
+    
+    def fidelity(self, level: Optional[int] = None) -> float:
+        return self._level(level).fidelity
+    
+    def _run(self, input_data: np.ndarray, session: ort.InferenceSession) -> np.ndarray:
+        start = time.perf_counter()
+        result = session.run([self.output_name], {self.input_name: input_data})[0]
+        latency_ms = (time.perf_counter() - start) * 1000
+        with self._latency_lock:
+            self.latency_ewma_ms += 0.1 * (latency_ms - self.latency_ewma_ms)
+        return result
+    
+    def predict_single(self, features: List[float], level: Optional[int] = None) -> float:
         input_data = np.array([features], dtype=np.float32)
-        result = self.session.run([self.output_name], {self.input_name: input_data})
+        if self.cache is not None:
+            return float(self.predict_array(input_data, level)[0])
+        result = self._run(input_data, self._level(level).session)
         return float(result[0][0])
     
-    def predict_batch(self, features: List[List[float]]) -> List[float]:
+    def predict_batch(self, features: List[List[float]], level: Optional[int] = None) -> List[float]:
         input_data = np.array(features, dtype=np.float32)
-        result = self.session.run([self.output_name], {self.input_name: input_data})
-        return [float(pred[0]) for pred in result[0]]
+        return self.predict_array(input_data, level).tolist()
+    
+    def predict_array(self, input_data: np.ndarray, level: Optional[int] = None) -> np.ndarray:
+        """Predict on a float32 [rows, n_features] array, returning a flat [rows] array"""
+        model_level = self._level(level)
+        if self.cache is None:
+            return self._predict_uncached(input_data, model_level.session)
+        keys = [prediction_key(model_level.model_id, row) for row in input_data]
+        values = self.cache.get_or_compute(
+            keys, lambda rows: self._predict_uncached(input_data[rows], model_level.session)
+        )
+        return np.array(values, dtype=np.float32)
+    
+    def _predict_uncached(self, input_data: np.ndarray, session: ort.InferenceSession) -> np.ndarray:
+        return self._run(input_data, session).reshape(len(input_data))
     
     def get_model_info(self) -> dict:
         return self.model_info
@@ -66,14 +171,21 @@ class ONNXInferenceEngine:
 # Try to create inference engine with better path handling
 print("Creating inference engine...")
 try:
-    inference_engine = ONNXInferenceEngine("linear_regression.onnx")
+    inference_engine = ONNXInferenceEngine(
+        "linear_regression.onnx", cache=prediction_cache,
+        load_fidelity_levels=config.DEGRADATION_ENABLED,
+    )
     print("Inference engine created successfully!")
 except Exception as e:
     print(f"Failed to create inference engine: {e}")
     # Create a dummy engine for testing
     class DummyEngine:
-        def predict_single(self, features): return 42.0
-        def predict_batch(self, features): return [42.0] * len(features)
+        levels = []
+        latency_ewma_ms = 0.0
+        def fidelity(self, level=None): return 1.0
+        def predict_single(self, features, level=None): return 42.0
+        def predict_batch(self, features, level=None): return [42.0] * len(features)
+        def predict_array(self, input_data, level=None): return np.full(len(input_data), 42.0, dtype=np.float32)
         def get_model_info(self): return {"input_shape": [5], "output_shape": [1], "model_type": "dummy", "framework": "none"}
     
     inference_engine = DummyEngine()
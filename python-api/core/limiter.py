@@ -0,0 +1,87 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from core import config
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter driven by the latency of admitted inference calls.
+
+    Modelled on Netflix concurrency-limits' AIMDLimit: while calls finish
+    within `target_latency_ms` and the current limit is actually being used,
+    the limit grows by one; a call over target multiplies it by
+    `backoff_ratio`. Each admitted request is one sample, timed for as long
+    as it holds its slot.
+
+    There is no batch-size knob: a batch runs as a single `session.run`
+    (ONNX Runtime already parallelises inside the call), and splitting it
+    within one slot only added calls without freeing capacity sooner.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency_ms: float,
+        backoff_ratio: float,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency_ms = target_latency_ms
+        self.backoff_ratio = backoff_ratio
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._latency_ewma_ms = 0.0
+        self._samples = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def latency_ewma_ms(self) -> float:
+        return self._latency_ewma_ms
+
+    @contextmanager
+    def measure(self):
+        """Time one admitted call and feed the result back into the limit"""
+        with self._lock:
+            self._in_flight += 1
+            in_flight = self._in_flight
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._in_flight -= 1
+                self._record(latency_ms, in_flight)
+
+    def _record(self, latency_ms: float, in_flight: int):
+        self._samples += 1
+        self._latency_ewma_ms += 0.1 * (latency_ms - self._latency_ewma_ms)
+
+        if latency_ms > self.target_latency_ms:
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+            return
+
+        if in_flight * 2 >= self._limit:
+            self._limit = min(self.max_limit, self._limit + 1)
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "target_latency_ms": self.target_latency_ms,
+            "latency_ewma_ms": round(self._latency_ewma_ms, 3),
+            "samples": self._samples,
+        }
+
+concurrency_limiter = AdaptiveLimiter(
+    initial_limit=config.MAX_IN_FLIGHT,
+    min_limit=config.MIN_IN_FLIGHT,
+    max_limit=config.ADAPTIVE_MAX_IN_FLIGHT,
+    target_latency_ms=config.TARGET_LATENCY_MS,
+    backoff_ratio=config.LIMIT_BACKOFF_RATIO,
+) if config.ADAPTIVE_CONCURRENCY else None
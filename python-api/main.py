@@ -1,6 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from api.compression import CompressionMiddleware
+from api.limits import ConcurrencyLimitMiddleware
 from api.routes import router
+from core import config
+import asyncio
 import uvicorn
 
 app = FastAPI(title="Python ONNX API", version="1.0.0")
@@ -13,7 +17,59 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=config.COMPRESSION_MIN_SIZE,
+    gzip_level=config.GZIP_LEVEL,
+    zstd_level=config.ZSTD_LEVEL,
+    max_decompressed_size=config.MAX_DECOMPRESSED_BYTES,
+    thread_min_size=config.COMPRESSION_THREAD_MIN_SIZE,
+)
+
 app.include_router(router)
 
+async def serve_hypercorn():
+    """Serve HTTP/1.1 and cleartext HTTP/2 (h2c, upgrade or prior knowledge)"""
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    hypercorn_config = Config()
+    hypercorn_config.bind = [f"{config.HOST}:{config.PORT}"]
+    hypercorn_config.keep_alive_timeout = config.KEEP_ALIVE_TIMEOUT_S
+    hypercorn_config.backlog = config.BACKLOG
+    hypercorn_config.h2_max_concurrent_streams = config.H2_MAX_CONCURRENT_STREAMS
+    # hypercorn has no limit_concurrency of its own
+    limited_app = app
+    if config.LIMIT_CONCURRENCY:
+        limited_app = ConcurrencyLimitMiddleware(app, config.LIMIT_CONCURRENCY)
+    await serve(limited_app, hypercorn_config)
+
+async def serve_uvicorn():
+    server = uvicorn.Server(uvicorn.Config(
+        app,
+        host=config.HOST,
+        port=config.PORT,
+        timeout_keep_alive=config.KEEP_ALIVE_TIMEOUT_S,
+        backlog=config.BACKLOG,
+        limit_concurrency=config.LIMIT_CONCURRENCY,
+    ))
+    await server.serve()
+
+async def serve():
+    # gRPC shares the event loop so both front ends go through one admission controller
+    grpc_server = None
+    if config.GRPC_ENABLED:
+        from api.grpc_service import start_grpc_server
+        grpc_server = await start_grpc_server()
+
+    try:
+        if config.SERVER == "hypercorn":
+            await serve_hypercorn()
+        else:
+            await serve_uvicorn()
+    finally:
+        if grpc_server is not None:
+            await grpc_server.stop(grace=5)
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    asyncio.run(serve())